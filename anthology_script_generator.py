@@ -25,20 +25,19 @@ Creates dicts with header, explanation, and list of instances for printing.
 
 # ------------------------------------------------------------------------------
 
+import list_processing
 import row_analyser
 import pc_sets
 import transformations
 
-import json
+from collections import defaultdict
 from typing import List, Dict
 
 
 # ------------------------------------------------------------------------------
 
 def retrieve_instances():
-    f = open('Repertoire_Anthology/rows_in_the_repertoire.json')
-    data = json.load(f)
-    f.close()
+    data = list_processing.loadRepertoire()  # NB: shared, cached entries: do not modify
 
     # Initialise dicts
     reused = {'header': 'Re-used Rows',
@@ -143,83 +142,70 @@ def retrieve_instances():
                         'list': []
                         }
 
-    p0dict = {}  # Special case for re-used
+    p0dict = defaultdict(list)  # Special case for re-used, keyed by row (as a tuple)
 
     interval_pattern_list = []
 
-    for x in data:
+    # The whole corpus as parallel lists, one entry per row, in the same order:
+    # the rows (as hashable tuples for the cached row_analyser functions),
+    # the names (composer: work), and the string combining the two used for most lists.
+    rows = [tuple(entry['P0']) for entry in data]
+    names = [f"{entry['Composer']}: {entry['Work']}" for entry in data]
+    rowStrings = [f'{name}, {list(row)}' for name, row in zip(names, rows)]
 
-        entry = data[x]
+    # Simple (True / False) properties: one pass over the whole corpus for each
+    for subject, test in [(allInterval, row_analyser.isAllInterval),
+                          (selfR, row_analyser.isSelfR),
+                          (selfRI, row_analyser.isSelfRI)]:
+        subject['list'] = [s for row, s in zip(rows, rowStrings) if test(row)]
 
-        row = entry['P0']  # Used below. Here to check it's 12-tone
+    derivedSegments = ((dyads, 2), (trichords, 3), (tetrachords, 4), (hexachords, 6))
 
-        basicString = f"{entry['Composer']}: {entry['Work']}"
+    for row, name, rowString in zip(rows, names, rowStrings):
 
         # Special case for re-used. TODO currently only P0 match: do I, R, RI as well
-        if str(row) in p0dict:
-            p0dict[str(row)].append(basicString)
-        else:
-            p0dict[str(row)] = [basicString]
-
-        basicString += f", {row}"  # For all except re-used, handled already
+        p0dict[row].append(name)
 
         # Derived
-        for segment in [(dyads, 2), (trichords, 3), (tetrachords, 4), (hexachords, 6)]:
+        for subject, segmentLength in derivedSegments:
 
-            discrete = row_analyser.getRowSegments(row,
-                                                   segmentLength=segment[1],
+            discrete = row_analyser.getRowSegments(list(row),
+                                                   segmentLength=segmentLength,
                                                    overlapping=False)
             cells = row_analyser.containsCell(discrete)
             if cells:
                 if len(cells) == 1:  # exactly one cell that accounts for all discrete segments
-                    extendedString = f'{basicString}, pc set {cells[0]}'
+                    extendedString = f'{rowString}, pc set {cells[0]}'
                     ip = row_analyser.isSelfRotational(discrete, returnIntervalPattern=True)
                     if ip:
-                        asString = "-".join([str(x) for x in ip]) + '-'
+                        asString = "-".join(map(str, ip)) + '-'
                         extendedString += f', self-rotational interval pattern {asString}'
                         interval_pattern_list.append(cells[0])
                         print(extendedString)
-                    segment[0]['list'].append(extendedString)
+                    subject['list'].append(extendedString)
                     if ip:
                         break
 
-        # All interval
-        if row_analyser.isAllInterval(row):
-            allInterval['list'].append(basicString)
-
-        # Self-RI
-        if row_analyser.isSelfR(row):
-            selfR['list'].append(basicString)
-
-        # Self-RI
-        if row_analyser.isSelfRI(row):
-            selfRI['list'].append(basicString)
-
         # Combinatorial
-        if row_analyser.combinatorialType(row) == 'A':
+        transpositions = row_analyser.fullCombinatorialTypes(row, returnAsString=False)
+        if transpositions['T'] and transpositions['I'] and transpositions['RI']:  # All
             allCom = row_analyser.fullCombinatorialTypes(row)
             prime = pc_sets.pitchesToPrime(row[:6])
-            allCombinatorial['list'].append(f'{basicString}, {allCom}, {prime}')
-        else:
-            t = row_analyser.combinatorialByTransform(row, transformation='T')
-            if t:
-                trans = ','.join([str(x) for x in t])
-                tCombinatorial['list'].append(basicString + f', P0-P{trans}')
-            else:
-                i = row_analyser.combinatorialByTransform(row, transformation='I')
-                if i:
-                    trans = ','.join([str(x) for x in i])
-                    iCombinatorial['list'].append(basicString + f', P0-I{trans}')
-                else:
-                    ri = row_analyser.combinatorialByTransform(row, transformation='RI')
-                    if ri:
-                        trans = ','.join([str(x) for x in ri])
-                        riCombinatorial['list'].append(basicString + f', P0-RI{trans}')
+            allCombinatorial['list'].append(f'{rowString}, {allCom}, {prime}')
+        elif transpositions['T']:
+            trans = ','.join(map(str, transpositions['T']))
+            tCombinatorial['list'].append(rowString + f', P0-P{trans}')
+        elif transpositions['I']:
+            trans = ','.join(map(str, transpositions['I']))
+            iCombinatorial['list'].append(rowString + f', P0-I{trans}')
+        elif transpositions['RI']:
+            trans = ','.join(map(str, transpositions['RI']))
+            riCombinatorial['list'].append(rowString + f', P0-RI{trans}')
 
     for k in p0dict:  # Special case for re-used
         v = p0dict[k]
         if len(v) > 1:
-            reused['list'].append(f'{k}: {"; ".join([y for y in v])}')
+            reused['list'].append(f'{list(k)}: {"; ".join(v)}')
 
     from collections import Counter
     interval_pattern_count = Counter([str(x) for x in interval_pattern_list])
@@ -243,20 +229,18 @@ def write_html(dicts: List[Dict]):
                 'please see the Row Properties chapter.'
                 ]
 
-    with open('Repertoire_Anthology/Serial_Anthology.html', "w") as text_file:
+    parts = [x + '\n' for x in preamble]
+
+    for subject in dicts:
+        parts.append("<div>\n"
+                     f"<h2>{subject['header']}</h2>\n"
+                     f"{subject['explanation']}\n"
+                     "<ol>\n")
+        parts.extend(f'<li>{x}\n' for x in subject['list'])
+        parts.append('</ol>\n</div>\n')
 
-        for x in preamble:
-            text_file.write(x + '\n')
-
-        for subject in dicts:
-            text_file.write('<div>' + '\n')
-            text_file.write(f"<h2>{subject['header']}</h2>" + '\n')
-            text_file.write(subject['explanation'] + '\n')
-            text_file.write('<ol>' + '\n')
-            for x in subject['list']:
-                text_file.write(f'<li>{x}' + '\n')
-            text_file.write('</ol>' + '\n')
-            text_file.write('</div>' + '\n')
+    with open('Repertoire_Anthology/Serial_Anthology.html', "w") as text_file:
+        text_file.write(''.join(parts))
 
 
 # ------------------------------------------------------------------------------
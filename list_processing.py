@@ -33,15 +33,54 @@ Also to
 
 import csv
 import os
-import json
 import unittest
 
+from functools import lru_cache
+from operator import itemgetter
 from typing import Optional, Union
 
+try:  # Optional: faster json parsing where available
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+# ------------------------------------------------------------------------------
+
+anthologyPath = os.path.join('.', 'Repertoire_Anthology')
+repertoireJsonPath = os.path.join(anthologyPath, 'rows_in_the_repertoire.json')
+repertoireCSVPath = os.path.join(anthologyPath, 'rows_in_the_repertoire.csv')
+
+defaultCSVKeys = ('Composer', 'Work', 'Year')  # NB: row assumed
+pitchIndexHeaders = tuple(range(1, 13))
+
+
+# ------------------------------------------------------------------------------
+
+def loadRepertoire(jsonPath: str = repertoireJsonPath):
+    """
+    Returns the entries of the main, json file (by default) as a tuple of dicts, one per row.
+
+    The file is only read and parsed again if it has been modified since the last call,
+    so repeated calls (e.g. from writeCSV, filterByKey, and getSources) share the same entries.
+    Accordingly, those entries should not be modified in place.
+    """
+    return loadRepertoireCached(jsonPath, os.path.getmtime(jsonPath))
+
+
+@lru_cache(maxsize=4)
+def loadRepertoireCached(jsonPath: str,
+                         modifiedTime: float):
+    """
+    Supporting function for `loadRepertoire`, cached by path and modification time.
+    """
+    with open(jsonPath, 'rb') as jsonFile:
+        return tuple(json_loads(jsonFile.read()).values())
+
 
 # ------------------------------------------------------------------------------
 
-def writeCSV(keysToUse=None,
+def writeCSV(keysToUse=defaultCSVKeys,
              numberPitchIndices: bool = True):
     """
     Writes a csv representation of the main, json file. 
@@ -51,35 +90,25 @@ def writeCSV(keysToUse=None,
     Beyond that, the default is to include ['Composer', 'Work', 'Year'] only.
     """
 
-    if keysToUse is None:
-        keysToUse = ['Composer', 'Work', 'Year']  # NB: row assumed
-
-    jsonPath = os.path.join('.', 'Repertoire_Anthology', 'rows_in_the_repertoire.json')
-    with open(jsonPath, 'r') as jsonFile:
+    data = sorted(loadRepertoire(), key=itemgetter('Composer', 'Work'))
 
-        data = json.load(jsonFile).values()
+    with open(repertoireCSVPath, 'w') as csvFile:
+        csvOut = csv.writer(csvFile, delimiter=',',
+                            quotechar='"', quoting=csv.QUOTE_MINIMAL)
 
-        data = sorted(data, key=lambda k: k['Work'])
-        data = sorted(data, key=lambda k: k['Composer'])
+        headers = list(keysToUse)
+        if numberPitchIndices:
+            headers += pitchIndexHeaders
 
-        csvPath = os.path.join('.', 'Repertoire_Anthology', 'rows_in_the_repertoire.csv')
-        with open(csvPath, 'w') as csvFile:
-            csvOut = csv.writer(csvFile, delimiter=',',
-                                quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        csvOut.writerow(headers)
 
-            headers = [x for x in keysToUse]
-            if numberPitchIndices:
-                headers += list(range(1, 13))
-
-            csvOut.writerow(headers)
-
-            for entry in data:
-                to_write = [entry[x] for x in keysToUse]  # fails if invalid header
-                if numberPitchIndices:
-                    [to_write.append(x) for x in entry['P0']]
-                else:
-                    to_write.append(entry['P0'])
-                csvOut.writerow(to_write)
+        keysToUse = tuple(keysToUse)
+        if numberPitchIndices:  # one column per pitch
+            csvOut.writerows([entry[x] for x in keysToUse] + entry['P0']  # fails if invalid key
+                             for entry in data)
+        else:  # the whole row in one column
+            csvOut.writerows([entry[x] for x in keysToUse] + [entry['P0']]
+                             for entry in data)
 
 
 # ------------------------------------------------------------------------------
@@ -102,12 +131,11 @@ def makeRowScore(data: Optional = None,
     count = 1
 
     if not data:
-        jsonPath = os.path.join('.', 'Repertoire_Anthology', 'rows_in_the_repertoire.json')
-        with open(jsonPath) as jsonFile:
-            data = json.load(jsonFile)
+        data = loadRepertoire()
+    elif isinstance(data, dict):  # keyed as in the main json file
+        data = data.values()
 
-    for d in data:  # dict
-        entry = data[d]
+    for entry in data:
         m = stream.Measure(number=count)
         count += 1
         row = serial.pcToToneRow(entry['P0'])
@@ -134,7 +162,7 @@ def makeRowScore(data: Optional = None,
     score.metadata.title = title
 
     if write:
-        w = os.path.join('.', 'Repertoire_Anthology', title + '.mxl')
+        w = os.path.join(anthologyPath, title + '.mxl')
         score.write(fmt='mxl', fp=w)
     else:
         return score
@@ -158,15 +186,12 @@ def filterByKey(dictKey: str = 'Composer',
     The comparison is case sensitive unless 'exactCaseMatch' is false.
     """
 
-    jsonPath = os.path.join('.', 'Repertoire_Anthology', 'rows_in_the_repertoire.json')
-
-    with open(jsonPath, 'r') as jsonFile:
-        data = json.load(jsonFile).values()
+    data = loadRepertoire()
 
-        if exactCaseMatch:
-            filtered_data = [x for x in data if x[dictKey] == dictValue]
-        else:
-            filtered_data = [x for x in data if (dictValue.lower() in x[dictKey].lower())]
+    if exactCaseMatch:
+        filtered_data = [x for x in data if x[dictKey] == dictValue]
+    else:
+        filtered_data = [x for x in data if (dictValue.lower() in x[dictKey].lower())]
 
     if score:
         if not title:
@@ -183,23 +208,16 @@ def getSources():
     Returns an alphabetically sorted list of distinct entries.
     """
 
-    p = os.path.join('.', 'Repertoire_Anthology', 'rows_in_the_repertoire.json')
-
-    sources = []
+    return sorted({cite.partition(',')[0]  # sans pages
+                   for entry in loadRepertoire()
+                   for cite in entry['Source'].split('; ')})
 
-    with open(p, 'r') as json_file:
-        data = json.load(json_file).values()
 
-        for x in data:
-            theseSources = x['Source'].split('; ')
-            sourcesSansPages = [x.split(',')[0] for x in theseSources]
-            for s in sourcesSansPages:
-                sources.append(s)
-
-    return sorted(list(set(sources)))
+# ------------------------------------------------------------------------------
 
+basePitchToPC = {'c': 0, 'd': 2, 'e': 4, 'f': 5, 'g': 7, 'a': 9, 'b': 11}
+accidentalToModifier = {'♭': -1, 'b': -1, '-': -1, '♯': 1, '#': 1, '+': 1}
 
-# ------------------------------------------------------------------------------
 
 def stringToPC(pitchString: str):
     """
@@ -236,31 +254,38 @@ def stringToPC(pitchString: str):
         raise TypeError('Invalid pitchString: must be a string')
 
     # 2: base pitch
-    basePitches = ['c', 'd', 'e', 'f', 'g', 'a', 'b']
     pitchString = pitchString.lower()
-    if pitchString[0] not in basePitches:
-        raise ValueError(f'Invalid first character: must be one of {basePitches}.')
+    basePC = basePitchToPC.get(pitchString[0])
+    if basePC is None:
+        raise ValueError(f'Invalid first character: must be one of {list(basePitchToPC)}.')
+
+    if len(pitchString) == 1:
+        return basePC
 
     # 3: valid accidental
-    modifier = 0
-    if len(pitchString) > 1:
-        accidental = pitchString[1]
-        if accidental in ['♭', 'b', '-']:
-            modifier = -1
-        elif accidental in ['♯', '#', '+']:
-            modifier = +1
-        else:
-            raise ValueError('Invalid second character: must be an accidental.')
+    accidental = pitchString[1]
+    modifier = accidentalToModifier.get(accidental)
+    if modifier is None:
+        raise ValueError('Invalid second character: must be an accidental.')
 
     # 4: same accidental
-    if len(pitchString) > 2:
-        for x in pitchString[2:]:
-            assert (x == accidental)
-        modifier *= len(pitchString) - 1
+    for x in pitchString[2:]:
+        assert (x == accidental)
 
-    initialDict = {'c': 0, 'd': 2, 'e': 4, 'f': 5, 'g': 7, 'a': 9, 'b': 11}
+    return (basePC + modifier * (len(pitchString) - 1)) % 12
 
-    return initialDict[pitchString[0]] + modifier % 12
+
+# Pitch class by (ASCII) character code for the no-divider row notation e.g. 014295B38A76:
+# digits as themselves, 'a'/'t' for 10, and 'b'/'e' for 11 (either case); 255 for anything else.
+charCodeToPC = bytearray(int(c) if c.isdigit() else
+                         10 if c in 'atAT' else
+                         11 if c in 'beBE' else
+                         255
+                         for c in map(chr, range(128)))
+
+
+# For removing brackets and new lines from row strings in one pass.
+bracketsAndNewLinesTable = str.maketrans('', '', '\n[]<>()')
 
 
 def standardiseRow(row: Union[str, list],
@@ -278,12 +303,16 @@ def standardiseRow(row: Union[str, list],
     rowList = None
 
     if type(row) == list:
+        if all(type(x) == int for x in row):  # already ints, so nothing to convert
+            if t0:
+                return [(x - row[0]) % 12 for x in row]
+            else:
+                return row
         rowList = row
 
     elif type(row) == str:  # then convert it into a list
 
-        for x in ['\n', '[', ']', '<', '>', '(', ')']:
-            row = row.replace(x, '')
+        row = row.translate(bracketsAndNewLinesTable)
 
         dividers = [', ', ',', ' ', '~', '-', '–']
         # NB: order matters:
@@ -295,15 +324,20 @@ def standardiseRow(row: Union[str, list],
                 break  # Assume only one and avoid '-' if possible.
 
         if not rowList:  # last try assuming no-divider notation e.g. 014295B38A76
-            rowList = list(row)
+            # NB: 'a' should not be a pitch in context, likewise 'b' and 'e'
+            if row.isascii():
+                rowList = [charCodeToPC[x] for x in row.encode('ascii')]
 
-            for x in range(len(rowList)):
-                if rowList[x].lower() in ['a', 't']:  # NB: 'a' should not be a pitch in context ...
-                    rowList[x] = 10
-                elif rowList[x].lower() in ['b', 'e']:  # ... likewise 'b' and 'e
-                    rowList[x] = 11
-                else:
-                    rowList[x] = int(rowList[x])
+            if not row.isascii() or 255 in rowList:  # fall back to character by character
+                rowList = list(row)
+
+                for x in range(len(rowList)):
+                    if rowList[x].lower() in ['a', 't']:
+                        rowList[x] = 10
+                    elif rowList[x].lower() in ['b', 'e']:
+                        rowList[x] = 11
+                    else:
+                        rowList[x] = int(rowList[x])
 
             if t0:  # duplicates end for special case of e.g. 014295B38A76
                 return [(x - rowList[0]) % 12 for x in rowList]
@@ -341,6 +375,7 @@ class ListTester(unittest.TestCase):
                  ('C', 0),
                  ('C#', 1), ('C♯', 1), ('C+', 1),
                  ('C##', 2), ('C♯♯', 2), ('C++', 2),
+                 ('B#', 0), ('Bb', 10), ('E##', 6),
                  )
         for p in pairs:
             self.assertEqual(stringToPC(p[0]), p[1])
@@ -350,6 +385,7 @@ class ListTester(unittest.TestCase):
         Tests some of the supported formats rationalised by standardiseRow:
          string of ints with <> angle brackets and '-' dividers,
          string of strings no brackets and ',' dividers,
+         the same with '-' for flats (so only ',' is a divider here),
          list of ints (requires only transposition), and
          list of strings.
         """
@@ -358,16 +394,30 @@ class ListTester(unittest.TestCase):
                            [0, 4, 1, 11, 10, 3, 6, 5, 9, 8, 2, 7])
         LutyensTheNumbered = ('G#,F#,G,A,Bb,F,B,C,E,C#,Eb,D',
                               [0, 10, 11, 1, 2, 9, 3, 4, 8, 5, 7, 6])
+        LutyensTheNumberedFlatsAsDashes = ('G#,F#,G,A,B-,F,B,C,E,C#,E-,D',
+                                           [0, 10, 11, 1, 2, 9, 3, 4, 8, 5, 7, 6])
         MorrisNotLilacs = ('014295B38A76', [0, 1, 4, 2, 9, 5, 11, 3, 8, 10, 7, 6])
         SmithEvocation = ([9, 10, 4, 11, 6, 2, 5, 0, 7, 8, 1, 3],
                           [0, 1, 7, 2, 9, 5, 8, 3, 10, 11, 4, 6])
         WebernKonzert = (['11', '10', '2', '3', '7', '6', '8', '4', '5', '0', '1', '9'],
                          [0, 11, 3, 4, 8, 7, 9, 5, 6, 1, 2, 10])
 
-        for entry in [GerhardConcerto, LutyensTheNumbered, MorrisNotLilacs,
+        for entry in [GerhardConcerto, LutyensTheNumbered, LutyensTheNumberedFlatsAsDashes,
+                      MorrisNotLilacs,
                       SmithEvocation, WebernKonzert]:
             self.assertEqual(standardiseRow(entry[0]), entry[1])
 
+    def testLoadRepertoire(self):
+        """
+        Tests that repeated loads of the (unchanged) json file share one cached result.
+        """
+        data = loadRepertoire()
+        self.assertIs(loadRepertoire(), data)
+        import json
+        with open(repertoireJsonPath) as jsonFile:
+            self.assertEqual(list(data), list(json.load(jsonFile).values()))
+        self.assertEqual(len(data[0]['P0']), 12)
+
     def testSources(self):
         s = getSources()
         self.assertEqual(s[0], 'Alegant+2006')
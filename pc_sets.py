@@ -45,8 +45,8 @@ Robert Morris's table and brief explanation (with further sources) here:
 http://ecmc.rochester.edu/rdm/pdflib/set-class.table.pdf
 """
 
+from functools import lru_cache
 from typing import Union, List, Tuple
-import transformations
 import unittest
 
 # ------------------------------------------------------------------------------
@@ -319,6 +319,14 @@ setClassesList = (
 
 )
 
+pitchClasses = frozenset(range(12))  # for validating input pitches
+
+# Indexes of those entries by prime form and by interval vector
+# (the latter as lists, as Z-related pairs share an interval vector).
+primeToEntry = {entry[1]: entry for data in setClassesList if data for entry in data}
+intervalVectorToEntries = {vector: [entry for entry in primeToEntry.values() if entry[2] == vector]
+                           for vector in {entry[2] for entry in primeToEntry.values()}}
+
 
 def setClassesFromCardinality(cardinality: int):
     """
@@ -335,12 +343,11 @@ def primeToCombinatoriality(prime: Tuple[int]):
     """
     In: a prime form expressed as a Tuple of integers.
     Out: the combinatoriality status as a string.
+    Raises a ValueError for anything other than a hexachord.
     """
-    data = setClassesFromCardinality(len(prime))
-    for x in data:
-        if x[1] == prime:
-            return x[3]
-    raise ValueError(f'{prime} is not a valid prime form')
+    if prime not in primeToEntry:
+        raise ValueError(f'{prime} is not a valid prime form')
+    return entryToCombinatoriality(primeToEntry[prime])
 
 
 def intervalVectorToCombinatoriality(vector: Tuple[int]):
@@ -349,19 +356,22 @@ def intervalVectorToCombinatoriality(vector: Tuple[int]):
     expressed as a Tuple of 6 integers.
     Out: the combinatoriality status of any valid interval vector as a
     string (one of T, I, RI, A, or an empty string for non-combinatorial cases).
+    Raises a ValueError for anything other than a hexachord vector.
     """
-    if len(vector) != 6:
+    if vector not in intervalVectorToEntries:
         raise ValueError(f'{vector} is not a valid interval vector')
-    total = sum(vector)
-    totalToCardinality = {1: 2,
-                          3: 3,
-                          6: 4,
-                          15: 6}
-    data = setClassesFromCardinality(totalToCardinality[total])
-    for x in data:
-        if x[2] == vector:
-            return x[-1]
-    raise ValueError(f'{vector} is not a valid interval vector')
+    return entryToCombinatoriality(intervalVectorToEntries[vector][0])
+
+
+def entryToCombinatoriality(entry: Tuple):
+    """
+    Supporting function for `primeToCombinatoriality` and `intervalVectorToCombinatoriality`.
+    In: one entry of the `setClassesList`.
+    Out: the combinatoriality status, if given (hexachords only).
+    """
+    if len(entry) != 5:
+        raise ValueError(f'No combinatoriality status for {entry[0]}: hexachords only.')
+    return entry[4]
 
 
 def pitchesToCombinatoriality(pitches: Union[List, Tuple]):
@@ -379,21 +389,23 @@ def pitchesToIntervalVector(pitches: Union[List, Tuple]):
     Out: the interval vector.
     """
 
-    pitches = list(set(pitches))  # remove any duplicates
+    if not pitchClasses.issuperset(pitches):
+        raise ValueError(f'{pitches} must contain only integers from 0-11')
 
-    for p in pitches:
-        if p not in range(12):
-            raise ValueError(f'{pitches} must contain only integers from 0-11')
-
-    vector = [0, 0, 0, 0, 0, 0]
-    from itertools import combinations
-    for p in combinations(pitches, 2):
-        ic = p[1] - p[0]
-        if ic < 0:
-            ic *= -1
-        if ic > 6:
-            ic = 12 - ic
-        vector[ic - 1] += 1
+    return maskToIntervalVector(pitchesToMask(pitches))  # NB: mask removes any duplicates
+
+
+def maskToIntervalVector(mask: int):
+    """
+    In: a pitch class set expressed as a 12-bit mask (see `pitchesToMask`).
+    Out: the interval vector.
+
+    The count for each interval class n is the number of pitches in the set
+    that are also in the set transposed by n,
+    except for the tritone (6) which counts each pair twice (up and down).
+    """
+    vector = [bin(mask & transposeMaskBy(mask, n)).count('1') for n in range(1, 7)]
+    vector[5] //= 2
     return tuple(vector)
 
 
@@ -402,12 +414,10 @@ def pitchesToForteClass(pitches: Union[List, Tuple]):
     In: a list or tuple of pitches expressed as integers (0–11) for sets with 2-10 distinct pitches.
     Out: the Forte class.
     """
-    data = setClassesFromCardinality(len(pitches))
     prime = pitchesToPrime(pitches)
-    for x in data:
-        if x[1] == prime:
-            return x[0]
-    raise ValueError(f'{pitches} is not a valid entry.')
+    if len(prime) != len(pitches):
+        raise ValueError(f'{pitches} is not a valid entry.')
+    return primeToEntry[prime][0]
 
 
 def pitchesToPrime(pitches: Union[List, Tuple]):
@@ -421,44 +431,124 @@ def pitchesToPrime(pitches: Union[List, Tuple]):
 
     In those cases, the prime form is worked out by comparing the pitch list against the pair of
     options in both inversions until a match is found.
+
+    The result depends only on the pitch class set, so this is computed (and cached)
+    by `maskToPrime` from the set's 12-bit mask.
     """
+    if not pitchClasses.issuperset(pitches):
+        raise ValueError(f'{pitches} must contain only integers from 0-11')
 
-    pitches = list(set(pitches))  # remove any duplicates
+    return maskToPrime(pitchesToMask(pitches))
 
-    vector = pitchesToIntervalVector(pitches)
-    primes = []
-    data = setClassesFromCardinality(len(set(pitches)))
 
-    for x in data:
-        if x[2] == vector:
-            primes.append(x[1])
+@lru_cache(maxsize=None)
+def maskToPrime(mask: int):
+    """
+    In: a pitch class set expressed as a 12-bit mask (see `pitchesToMask`).
+    Out: the prime form.
 
-    if len(primes) == 1:
-        return primes[0]
-    elif len(primes) > 1:
-        for prime in primes:  # each possible prime form
-            invertedPrime = transformations.invert(prime)
-            for t in [prime, invertedPrime]:
-                if transpositionEquivalent(t, pitches):
+    Supporting function for `pitchesToPrime`.
+    There are only 4096 possible masks, so results are cached for all repeated calls.
+    """
+    setClassesFromCardinality(bin(mask).count('1'))  # validate
+    entries = intervalVectorToEntries[maskToIntervalVector(mask)]
+
+    if len(entries) == 1:
+        return entries[0][1]
+    else:  # Z-related
+        for entry in entries:  # each possible prime form
+            prime = entry[1]
+            primeMask = pitchesToMask(prime)
+            for t in [primeMask, invertMask(primeMask)]:
+                if masksTranspositionEquivalent(t, mask):
                     return prime
 
 
+def pitchesToMask(pitches: Union[List, Tuple]):
+    """
+    In: a list or tuple of pitches expressed as integers.
+    Out: the pitch class set as a 12-bit integer 'mask' in which
+    bit n is set if pitch class n is present (so (0, 1, 4) gives 0b10011, i.e. 19).
+
+    Duplicates are ignored and pitches are taken modulo 12.
+    This representation makes set operations cheap integer operations, e.g.
+    the complement of a mask is `0xFFF ^ mask`.
+    """
+    mask = 0
+    for p in pitches:
+        mask |= 1 << (p % 12)
+    return mask
+
+
+def transposeMaskBy(mask: int,
+                    semitones: int = 0):
+    """
+    Transposes a pitch class set expressed as a 12-bit mask (see `pitchesToMask`)
+    by an interval of size set by the value of 'semitones'.
+    This is a rotation of the 12 bits.
+    """
+    semitones %= 12
+    return ((mask << semitones) | (mask >> (12 - semitones))) & 0xFFF
+
+
+def invertMask(mask: int):
+    """
+    Inverts a pitch class set expressed as a 12-bit mask (see `pitchesToMask`)
+    such that each pitch class p becomes (12 - p) % 12.
+    This is a reversal of the 12 bits (p to 11 - p) and a transposition up by 1.
+    """
+    return transposeMaskBy(int(f'{mask:012b}'[::-1], 2), 1)
+
+
 def transpositionEquivalent(set1, set2):
     """
-    Supporting function for determining whether two sets are transposition equivalent
-    as part of determining prime forms with `pitchesToPrime`.
+    Determines whether two sets (expressed as lists or tuples of pitches) are transposition equivalent.
+    """
+    return masksTranspositionEquivalent(pitchesToMask(set1), pitchesToMask(set2))
+
+
+def masksTranspositionEquivalent(mask1: int,
+                                 mask2: int):
+    """
+    Determines whether two sets expressed as 12-bit masks (see `pitchesToMask`)
+    are transposition equivalent,
+    as part of determining prime forms with `maskToPrime`.
     """
-    sortedSet2 = sorted(list(set2))
-    for i in range(12):
-        testCase = sorted(list(transformations.transposeBy(set1, i)))
-        if testCase == sortedSet2:
-            return True
+    return any(transposeMaskBy(mask1, i) == mask2 for i in range(12))
 
 
 # ------------------------------------------------------------------------------
 
 class PCTester(unittest.TestCase):
 
+    def testMasks(self):
+        """
+        Tests the 12-bit mask representation of pitch class sets, and transposition thereof.
+        """
+        self.assertEqual(pitchesToMask((0, 1, 4)), 0b10011)
+        self.assertEqual(pitchesToMask([4, 1, 0, 12]), 0b10011)  # order, duplicates, mod 12
+        self.assertEqual(transposeMaskBy(0b10011, 2), pitchesToMask((2, 3, 6)))
+        self.assertTrue(transpositionEquivalent((0, 1, 4), (2, 3, 6)))
+        self.assertFalse(transpositionEquivalent((0, 1, 4), (0, 3, 4)))  # inversion only
+        self.assertEqual(transposeMaskBy(pitchesToMask((9, 11)), 3), pitchesToMask((0, 2)))
+        self.assertEqual(invertMask(pitchesToMask((0, 1, 4))), pitchesToMask((0, 11, 8)))
+        self.assertEqual(maskToIntervalVector(pitchesToMask((0, 1, 4, 6))), (1, 1, 1, 1, 1, 1))
+        self.assertEqual(maskToIntervalVector(pitchesToMask((0, 6))), (0, 0, 0, 0, 0, 1))
+
+    def testLookups(self):
+        """
+        Tests retrieval of entry properties via the prime form and interval vector indexes.
+        """
+        wholeTone = (0, 2, 4, 6, 8, 10)
+        self.assertEqual(primeToCombinatoriality(wholeTone), 'A')
+        self.assertEqual(intervalVectorToCombinatoriality((0, 6, 0, 6, 0, 3)), 'A')
+        self.assertEqual(pitchesToForteClass(wholeTone), '6-35')
+        self.assertEqual(pitchesToForteClass((7, 0, 4)), '3-11')
+        self.assertRaises(ValueError, primeToCombinatoriality, (0, 1, 7))
+        self.assertRaises(ValueError, primeToCombinatoriality, (0, 1, 2))  # not a hexachord
+        self.assertRaises(ValueError, pitchesToCombinatoriality, [0, 1, 2, 3, 4])
+        self.assertRaises(ValueError, pitchesToForteClass, (0, 0, 4))
+
     def testPitchesToPrime(self):
         """
         Tests one case through the interval vector, and another that requires transformation.
@@ -479,8 +569,7 @@ class PCTester(unittest.TestCase):
         countTotal = 0
         for entry in setClassesFromCardinality(6):
             hexachord = entry[1]
-            complement = tuple([x for x in range(12) if x not in hexachord])
-            complementPrime = pitchesToPrime(complement)
+            complementPrime = maskToPrime(0xFFF ^ pitchesToMask(hexachord))
             if hexachord == complementPrime:
                 self.assertFalse('Z' in entry[0])
                 countHexachords += 1
@@ -23,6 +23,7 @@ Functions for investigating the properties of tone rows, centered on:
 """
 
 from collections import Counter
+from functools import lru_cache, wraps
 from typing import Union, List, Tuple
 import unittest
 
@@ -30,6 +31,30 @@ import transformations
 import pc_sets
 
 
+# ------------------------------------------------------------------------------
+
+def cachedByRow(function):
+    """
+    Decorator for memoising the pure functions of this module which are called on a row.
+
+    The row (the first argument) is converted to a tuple so that it can be hashed,
+    and any repeated call with the same row (and other arguments) is then looked up
+    rather than computed again.
+    This helps for collections like the repertoire anthology in which the same row recurs.
+
+    Only use this on functions that return immutable values (bool, str, tuple).
+    """
+    cachedFunction = lru_cache(maxsize=None)(function)
+
+    @wraps(function)
+    def wrapper(row, *args, **kwargs):
+        return cachedFunction(tuple(row), *args, **kwargs)
+
+    wrapper.cache_info = cachedFunction.cache_info
+    wrapper.cache_clear = cachedFunction.cache_clear
+    return wrapper
+
+
 # ------------------------------------------------------------------------------
 
 def getRowSegments(row: Union[List, Tuple],
@@ -81,12 +106,10 @@ def getRowSegments(row: Union[List, Tuple],
 
     if overlapping:
         if wrap:
-            row += row[:segmentLength - 1]
+            row = row + row[:segmentLength - 1]  # NB: a new list; leave the input as is
             totalPitches = len(row)
 
-        nChords = []
-        for i in range(totalPitches - (segmentLength - 1)):
-            nChords.append(row[i:i + segmentLength])
+        nChords = [row[i:i + segmentLength] for i in range(totalPitches - (segmentLength - 1))]
 
     else:  # Discrete (not overlapping)
         steps = totalPitches / segmentLength
@@ -116,18 +139,20 @@ def containsCell(segmentsListOfLists: List,
     this can be called on overlapping segments or indeed on any other list of segments.
     """
 
-    primeSegs = [str(pc_sets.pitchesToPrime(seg)) for seg in segmentsListOfLists]
+    # Prime forms are cached by pitch class set (see pc_sets.maskToPrime)
+    primes = (pc_sets.pitchesToPrime(seg) for seg in segmentsListOfLists)
+
+    if exactlyOne:  # stop at the first segment that differs
+        first = next(primes, None)
+        if len(segmentsListOfLists) > 1 and all(x == first for x in primes):
+            return [str(first)]
+        return False
 
-    countDict = Counter(primeSegs)
-    repeated = [x for x in countDict if countDict[x] > 1]
+    countDict = Counter(primes)
+    repeated = [str(x) for x in countDict if countDict[x] > 1]
 
     if not repeated:
         return False
-    if exactlyOne:
-        if len(countDict) == 1:
-            return repeated
-        else:
-            return False
     return repeated
 
 
@@ -173,9 +198,10 @@ def is12tone(row: Union[List, Tuple]):
     12 notes long (not shorter or longer) and
     there are no duplicated pitches within the 12.
     """
-    return sorted(row) == list(range(12))
+    return len(row) == 12 and set(row) == pc_sets.pitchClasses
 
 
+@cachedByRow
 def isAllInterval(row: Union[List, Tuple],
                   require12tone: bool = True):
     """
@@ -187,39 +213,40 @@ def isAllInterval(row: Union[List, Tuple],
         if not is12tone(row):
             return False
 
-    intervals = transformations.pitchesToIntervals(row)
-    for x in range(1, 12):
-        if x not in intervals:
-            return False
+    intervalMask = 0  # bit n set if interval n is present
+    for i in range(1, len(row)):
+        intervalMask |= 1 << ((row[i] - row[i - 1]) % 12)
 
-    return True
+    return intervalMask & 0xFFE == 0xFFE  # all of 1–11
 
 
+@cachedByRow
 def isSelfR(row: Union[List, Tuple]):
     """
     True if the retrograde of a row is transposition-equivalent to the prime.
     """
 
-    r0 = row[::-1]
-    r_t0 = transformations.transposeTo(r0, 0)
-
-    if row == r_t0:
-        return True
+    # I.e. row == transformations.transposeTo(row[::-1], 0), compared pitch by pitch
+    last = row[-1]
+    return all(row[i] == (row[-1 - i] - last) % 12 for i in range(len(row)))
 
 
+@cachedByRow
 def isSelfRI(row: Union[List, Tuple]):
     """
     True if the interval succession of a row is a palindrome.
     I.e. the interval succession is the same backwards and forwards.
     """
 
-    intervals = transformations.pitchesToIntervals(row)
-    if intervals == intervals[::-1]:
-        return True
+    # Compare each interval with its counterpart from the end (in place, without a list)
+    n = len(row)
+    return all((row[i + 1] - row[i]) % 12 == (row[n - 1 - i] - row[n - 2 - i]) % 12
+               for i in range(n // 2))
 
 
 # ------------------------------------------------------------------------------
 
+@cachedByRow
 def combinatorialType(row: Union[List, Tuple]):
     """
     Rows can be
@@ -254,8 +281,8 @@ def combinatorialPair(row1: Union[List, Tuple],
     for row in [row1, row2]:
         if len(row) != 12:
             raise ValueError('This function is designed for 12-tone rows')
-    newRow = sorted(row1[:6] + row2[:6])
-    return newRow == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+    # 12 pitches making up all 12 pitch classes, so the two hexachords are disjoint.
+    return pc_sets.pitchesToMask(row1[:6]) | pc_sets.pitchesToMask(row2[:6]) == 0xFFF
 
 
 def combinatorialByTransform(row: Union[List, Tuple],
@@ -286,25 +313,45 @@ def combinatorialByTransform(row: Union[List, Tuple],
                          '"I" for inversion, '
                          'or "RI" for retrograde-inversion.')
 
-    if returnTypes:
-        returnMatch = []
-
-    comparisonRow = [x for x in row]
-    if transformation in ['I', 'RI']:
-        comparisonRow = transformations.invert(comparisonRow)
-        if transformation == 'RI':
-            comparisonRow = transformations.retrograde(comparisonRow)
-
-    for i in range(12):
-        comparisonRow = transformations.transposeBy(comparisonRow, 1)
-        if combinatorialPair(comparisonRow, row):
-            if returnTypes:
-                returnMatch.append(i + 1)  # NB
-            else:
-                return True
+    matches = combinatorialTranspositions(row)[['T', 'I', 'RI'].index(transformation)]
 
     if returnTypes:
-        return returnMatch
+        return list(matches)
+    return bool(matches)
+
+
+@cachedByRow
+def combinatorialTranspositions(row: Union[List, Tuple]):
+    """
+    Supporting function for `combinatorialByTransform` and `fullCombinatorialTypes`.
+
+    Returns the transpositions in which each of
+    transposition, inversion, and retrograde-inversion (in that order)
+    is combinatorial with the row itself, as a tuple of three tuples.
+    For instance, the chromatic scale returns ((6,), (11,), (5,)).
+
+    All three are tested in a single pass through the 12 transpositions.
+    """
+    if len(row) != 12:
+        raise ValueError('This function is designed for 12-tone rows')
+
+    # Compare 12-bit masks (see pc_sets.pitchesToMask) of the first hexachords
+    rowMask = pc_sets.pitchesToMask(row[:6])
+    complementMask = 0xFFF ^ rowMask
+
+    comparisonMasks = (
+        rowMask,  # T
+        pc_sets.pitchesToMask([row[0] - x for x in row[:6]]),  # I: inverted around the first pitch
+        pc_sets.pitchesToMask([row[0] - x for x in row[6:]])  # RI: 1st hexachord = I's 2nd
+    )
+
+    matches = ([], [], [])
+    for i in range(1, 13):  # NB: 1-12
+        for mask, match in zip(comparisonMasks, matches):
+            if pc_sets.transposeMaskBy(mask, i) == complementMask:
+                match.append(i)
+
+    return tuple(tuple(match) for match in matches)
 
 
 def fullCombinatorialTypes(row: Union[List, Tuple],
@@ -328,8 +375,8 @@ def fullCombinatorialTypes(row: Union[List, Tuple],
     """
 
     outDict = {}
-    for transform in ['T', 'I', 'RI']:
-        outDict[transform] = [x for x in combinatorialByTransform(row, transform)]
+    for transform, matches in zip(['T', 'I', 'RI'], combinatorialTranspositions(row)):
+        outDict[transform] = list(matches)
 
     if returnAsString:
         outList = []
@@ -378,6 +425,7 @@ class SerialTester(unittest.TestCase):
         trichords = getRowSegments(konzert, overlapping=False, segmentLength=3)
         self.assertEqual(trichords, [[0, 11, 3], [4, 8, 7], [9, 5, 6], [1, 2, 10]])
         self.assertEqual(containsCell(trichords), ['(0, 1, 4)'])
+        self.assertRaises(ValueError, containsCell, [[0, 12, 4], [1, 13, 5]])  # pitches 0-11 only
 
     def testAllTrichord(self):
         """
@@ -398,6 +446,7 @@ class SerialTester(unittest.TestCase):
                                        segmentLength=3,
                                        wrap=True)
             self.assertEqual(len(trichords), 12)
+            self.assertEqual(len(row), 12)  # input row unchanged by the wrap
             cells = containsCell(trichords)  # checks for repeated cells
             self.assertFalse(cells)  # I.e. no repeated cells
 
@@ -439,6 +488,7 @@ class SerialTester(unittest.TestCase):
         self.assertFalse(is12tone(halfChromaticRow))
         self.assertFalse(is12tone(doubleChromaticRow))
         self.assertFalse(is12tone(pitchDuplicate))
+        self.assertFalse(is12tone([12, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]))  # not mod 12
 
     def testSelfRIAndAllInterval(self):
         """
@@ -489,6 +539,20 @@ class SerialTester(unittest.TestCase):
             self.assertEqual(combinatorialType(r[0]), 'A')
             self.assertEqual(fullCombinatorialTypes(r[0]), r[1])
 
+    def testCachedByRow(self):
+        """
+        Test that the cached functions give the same result for a row as a list or a tuple,
+        and that modifying a returned list does not affect the cached value.
+        """
+        rowSmith = [0, 5, 6, 4, 10, 11, 7, 2, 1, 3, 9, 8]
+        self.assertEqual(combinatorialType(rowSmith), combinatorialType(tuple(rowSmith)))
+        self.assertEqual(isSelfRI(rowSmith), isSelfRI(tuple(rowSmith)))
+
+        transpositions = combinatorialByTransform(rowSmith, 'T')
+        self.assertEqual(transpositions, [3, 9])
+        transpositions.append(0)
+        self.assertEqual(combinatorialByTransform(tuple(rowSmith), 'T'), [3, 9])
+
     def testCombinatoriality(self):
 
         hexachords = pc_sets.setClassesFromCardinality(6)
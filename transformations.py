@@ -36,10 +36,7 @@ def transposeBy(row: Union[List, Tuple],
     Transposes a row (as a list of pitch classes) by an interval of size
     set by the value of 'semitones'.
     """
-    zeroList = []
-    for x in range(len(row)):
-        zeroList.append((row[x] + semitones) % 12)
-    return zeroList
+    return [(x + semitones) % 12 for x in row]
 
 
 def transposeTo(row: Union[List, Tuple],
@@ -48,11 +45,8 @@ def transposeTo(row: Union[List, Tuple],
     Transposes a row (as a list of pitch classes) to start on 0 (by default), or
     any another number from 0-12 set by the value of 'start'.
     """
-    firstPC = row[0]
-    zeroList = []
-    for y in range(len(row)):
-        zeroList.append((row[y] - firstPC + start) % 12)
-    return zeroList
+    semitones = start - row[0]
+    return [(x + semitones) % 12 for x in row]
 
 
 def retrograde(row: Union[List, Tuple]):
@@ -80,11 +74,9 @@ def pitchesToIntervals(row: Union[List, Tuple],
     By default (wrap = False) this function returns 11 intervals for a 12 tone row.
     Setting wrap to True gives the '12th' interval: that between the last and the first pitch.
     """
-    intervals = []
+    intervals = [(row[i] - row[i - 1]) % 12 for i in range(1, len(row))]
     if wrap:
-        row += row[0]
-    for i in range(1, len(row)):
-        intervals.append((row[i] - row[i - 1]) % 12)
+        intervals.append((row[0] - row[-1]) % 12)
     return intervals
 
 
@@ -98,11 +90,11 @@ def rotate(row: Union[List, Tuple],
     Rotates a row through N steps (i.e. starts on the Nth element).
 
     Should be called on an integer < 12.
-    If called on a larger integer, the value modulo 12 will be taken
-    (e.g. 15 becomes 3).
+    If called on a larger (or negative) integer, the value modulo the row length will be taken
+    (e.g. 15 becomes 3 for a 12-tone row).
     """
-    if steps > 12:
-        steps = steps % 12
+    if row:
+        steps %= len(row)
 
     return row[steps:] + row[:steps]
 
@@ -155,15 +147,13 @@ def pairSwapKrenek(row: Union[List, Tuple]):
     for pair in range(6):
 
         # First swap type, starting at position 1 (2nd pitch)
-        row = [x for x in row]
-        for x in range(1, 11, 2):
-            row[x], row[x + 1] = row[x + 1], row[x]
+        row = list(row)
+        row[1:11:2], row[2:12:2] = row[2:12:2], row[1:11:2]
         rows.append(row)
 
         # Second swap type, starting at position 0 (1st pitch)
-        row = [x for x in row]
-        for x in range(0, 12, 2):
-            row[x], row[x + 1] = row[x + 1], row[x]
+        row = list(row)
+        row[0:12:2], row[1:12:2] = row[1:12:2], row[0:12:2]
         rows.append(row)
 
     return rows
@@ -187,6 +177,9 @@ class RowTester(unittest.TestCase):
         for i in range(12):
             row = rotate(luto, i)
             self.assertEqual(row[0], luto[i])
+        self.assertEqual(rotate(luto, 15), rotate(luto, 3))
+        self.assertEqual(rotate(luto, -1), rotate(luto, 11))
+        self.assertEqual(rotate(luto[:6], 7), rotate(luto[:6], 1))
 
     def testInvert(self):
         testSet = [0, 1, 4, 6]
@@ -197,6 +190,8 @@ class RowTester(unittest.TestCase):
         self.assertEqual(pitchesToIntervals(testRowUp), [1]*11)
         testRowDown = testRowUp[::-1]
         self.assertEqual(pitchesToIntervals(testRowDown), [11]*11)
+        self.assertEqual(pitchesToIntervals(testRowUp, wrap=True), [1]*12)
+        self.assertEqual(len(testRowUp), 12)  # unchanged
 
     def testRotateHexachords(self):
         """Using Krenek's example"""